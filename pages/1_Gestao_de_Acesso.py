@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 from datetime import datetime
 
 import pandas as pd
@@ -42,12 +43,13 @@ with view_tab:
     search = st.text_input("Pesquisar usuário", placeholder="Nome, login ou e-mail")
     selected_roles = st.multiselect("Perfis", role_options, format_func=role_label)
     status_filter = st.radio("Situação", ["Todos", "Ativos", "Inativos"], horizontal=True)
+    search_text = search.lower()
+    role_set = set(selected_roles)
     filtered = []
     for item in users:
-        text = " ".join([str(item.get("username", "")), str(item.get("name", "")), str(item.get("email", ""))]).lower()
-        if search and search.lower() not in text:
+        if search_text and search_text not in " ".join([str(item.get("username", "")), str(item.get("name", "")), str(item.get("email", ""))]).lower():
             continue
-        if selected_roles and item.get("role") not in selected_roles:
+        if role_set and item.get("role") not in role_set:
             continue
         if status_filter == "Ativos" and item.get("active") is False:
             continue
@@ -139,20 +141,36 @@ with delete_tab:
 with audit_tab:
     action_filter = st.text_input("Filtrar ações", placeholder="Login, salvou fluxo, publicou...")
     actor_filter = st.selectbox("Responsável", ["Todos", *sorted({str(item.get('user') or '') for item in logs if item.get('user')})])
+    action_text = action_filter.lower()
     filtered_logs = []
     for item in logs:
-        if action_filter and action_filter.lower() not in str(item.get("action") or "").lower():
+        if action_text and action_text not in str(item.get("action") or "").lower():
             continue
         if actor_filter != "Todos" and item.get("user") != actor_filter:
             continue
         filtered_logs.append({
-            "Data": str(item.get("timestamp") or "")[:19].replace("T", " "),
+            "Data": item.get("timestamp"),
             "Usuário": item.get("user"),
             "Ação": item.get("action"),
             "Detalhes": str(item.get("details") or ""),
         })
     if filtered_logs:
-        st.dataframe(pd.DataFrame(filtered_logs), use_container_width=True, hide_index=True)
-        st.download_button("Exportar auditoria CSV", pd.DataFrame(filtered_logs).to_csv(index=False).encode("utf-8-sig"), "produto_tools_auditoria.csv", "text/csv")
+        audit_frame = pd.DataFrame(filtered_logs)
+        audit_frame["Data"] = pd.to_datetime(audit_frame["Data"], utc=True, errors="coerce")
+        st.dataframe(
+            audit_frame,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Data": st.column_config.DatetimeColumn("Data", format="YYYY-MM-DD HH:mm:ss")},
+        )
+
+        def audit_csv() -> bytes:
+            # Executado somente no clique, fora do ciclo de renderização da página.
+            export_frame = audit_frame.assign(Data=audit_frame["Data"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna(""))
+            buffer = io.BytesIO()
+            export_frame.to_csv(buffer, index=False, encoding="utf-8-sig")
+            return buffer.getvalue()
+
+        st.download_button("Exportar auditoria CSV", audit_csv, "produto_tools_auditoria.csv", "text/csv")
     else:
         st.info("Nenhum evento de auditoria foi encontrado.")
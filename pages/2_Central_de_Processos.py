@@ -8,8 +8,8 @@ import streamlit as st
 from core.auth import render_account_sidebar, require_login
 from core.configuration import WORKFLOW_STATUS_LABELS
 from core.styles import apply_global_styles, page_header
-from services.flow_analytics import analyze_document, issue_detail_rows
-from services.flowchart_repository import get_flowchart, list_comments, list_flowcharts
+from services.flow_analytics import cached_analysis, issue_detail_rows
+from services.flowchart_repository import count_open_comments, get_flowcharts, list_flowcharts
 from services.project_repository import list_projects
 
 st.set_page_config(page_title="Central de Processos", page_icon="🗂️", layout="wide")
@@ -57,20 +57,38 @@ status_filter = st.multiselect(
     format_func=lambda value: WORKFLOW_STATUS_LABELS.get(value, value),
 )
 
-rows = []
+search_text = search.lower()
+status_set = set(status_filter)
+visible_flows = []
 for item in flows:
     if project_filter and item.get("project_id") != project_filter:
         continue
-    if search and search.lower() not in " ".join([item["name"], item.get("owner_username", ""), item.get("workflow_status", ""), project_by_id.get(item.get("project_id"), {}).get("name", "")]).lower():
+    if search_text and search_text not in " ".join([item["name"], item.get("owner_username", ""), item.get("workflow_status", ""), project_by_id.get(item.get("project_id"), {}).get("name", "")]).lower():
         continue
-    if status_filter and item.get("workflow_status") not in status_filter:
+    if status_set and item.get("workflow_status") not in status_set:
         continue
-    record = get_flowchart(item["id"], actor_username=username, is_admin=is_admin)
+    visible_flows.append(item)
+
+open_comment_counts = count_open_comments([item["id"] for item in visible_flows])
+rows = []
+published = in_review = quality_total = open_comments = 0
+quality_details_by_id: dict[str, list[dict[str, str]]] = {}
+records_by_id = {
+    record["id"]: record
+    for record in get_flowcharts([item["id"] for item in visible_flows], actor_username=username, is_admin=is_admin)
+}
+for item in visible_flows:
+    record = records_by_id.get(item["id"])
     if not record:
         continue
-    analysis = analyze_document(record["document"])
+    analysis = cached_analysis(record["document"], record.get("document_hash", ""))
     quality_details = issue_detail_rows(record["document"], analysis)
-    comments = list_comments(item["id"], include_resolved=False)
+    quality_details_by_id[item["id"]] = quality_details
+    comment_count = open_comment_counts.get(item["id"], 0)
+    published += item.get("workflow_status") == "published"
+    in_review += item.get("workflow_status") == "in_review"
+    quality_total += analysis["quality_score"]
+    open_comments += comment_count
     rows.append({
         "ID": item["id"],
         "Processo": item["name"],
@@ -83,17 +101,13 @@ for item in flows:
         "Qualidade": analysis["quality_score"],
         "Elementos": analysis["counts"]["nodes"],
         "Decisões": analysis["counts"]["decisions"],
-        "Comentários abertos": len(comments),
+        "Comentários abertos": comment_count,
         "Cards com problema": ", ".join(dict.fromkeys(detail["Card"] for detail in quality_details)) or "Nenhum",
         "Tipos de problema": ", ".join(dict.fromkeys(detail["Problema"] for detail in quality_details)) or "Nenhum",
-        "Detalhes de qualidade": quality_details,
         "Atualizado em": fmt(item.get("updated_at")),
     })
 
-published = sum(1 for row in rows if row["Status"] == WORKFLOW_STATUS_LABELS["published"])
-in_review = sum(1 for row in rows if row["Status"] == WORKFLOW_STATUS_LABELS["in_review"])
-average_quality = round(sum(row["Qualidade"] for row in rows) / len(rows)) if rows else 0
-open_comments = sum(row["Comentários abertos"] for row in rows)
+average_quality = round(quality_total / len(rows)) if rows else 0
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Processos", len(rows))
 col2.metric("Publicados", published)
@@ -101,7 +115,7 @@ col3.metric("Em revisão", in_review)
 col4.metric("Qualidade média", f"{average_quality}/100", help=f"{open_comments} comentários abertos no portfólio")
 
 if rows:
-    frame = pd.DataFrame([{key: value for key, value in row.items() if key != "Detalhes de qualidade"} for row in rows])
+    frame = pd.DataFrame(rows)
     st.dataframe(
         frame,
         use_container_width=True,
@@ -114,24 +128,26 @@ if rows:
             "Projeto ID": None,
         },
     )
-    with st.expander("Entender e corrigir os problemas de qualidade", expanded=False):
-        quality_name = st.selectbox("Processo", [row["Processo"] for row in rows], key="central_quality_process")
-        quality_row = next(row for row in rows if row["Processo"] == quality_name)
-        quality_details = quality_row.get("Detalhes de qualidade") or []
-        if quality_details:
-            st.dataframe(
-                pd.DataFrame(quality_details),
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Card ID": None,
-                    "Card": st.column_config.TextColumn("Card afetado", width="medium"),
-                    "Por que importa": st.column_config.TextColumn("Por que isso é um problema", width="large"),
-                    "Como corrigir": st.column_config.TextColumn("Como corrigir", width="large"),
-                },
-            )
-        else:
-            st.success("Este processo não possui problemas de qualidade identificados.")
+    quality_panel = st.expander("Entender e corrigir os problemas de qualidade", expanded=False, key="central_quality_panel", on_change="rerun")
+    with quality_panel:
+        if quality_panel.open:
+            quality_name = st.selectbox("Processo", [row["Processo"] for row in rows], key="central_quality_process")
+            quality_row = next(row for row in rows if row["Processo"] == quality_name)
+            quality_details = quality_details_by_id.get(quality_row["ID"]) or []
+            if quality_details:
+                st.dataframe(
+                    pd.DataFrame(quality_details),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Card ID": None,
+                        "Card": st.column_config.TextColumn("Card afetado", width="medium"),
+                        "Por que importa": st.column_config.TextColumn("Por que isso é um problema", width="large"),
+                        "Como corrigir": st.column_config.TextColumn("Como corrigir", width="large"),
+                    },
+                )
+            else:
+                st.success("Este processo não possui problemas de qualidade identificados.")
     selected_name = st.selectbox("Abrir processo", [row["Processo"] for row in rows])
     selected = next(row for row in rows if row["Processo"] == selected_name)
     if st.button("Abrir no editor", type="primary"):
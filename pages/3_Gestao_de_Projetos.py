@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from functools import partial
 from html import escape
 from pathlib import Path
 
@@ -306,52 +307,55 @@ with main_tabs[1]:
 
         selected_flow_record = get_flowchart(flow_select, actor_username=username, is_admin=is_admin)
         flow_can_delete = bool(selected_flow_record and (selected_flow_record.get("permission") == "owner" or is_admin))
-        with st.expander("Excluir fluxo permanentemente", expanded=False):
-            impacts = project_impact(selected_project_id, username, flow_select, is_admin=is_admin)
-            if impacts:
-                st.warning(f"Este fluxo é usado por {len(impacts)} card(s) de outros fluxos.")
-                st.dataframe(pd.DataFrame([{
-                    "Fluxo pai": item.get("source_flow_name"),
-                    "Card": item.get("source_node_label"),
-                } for item in impacts]), use_container_width=True, hide_index=True)
-            clean_references = st.checkbox(
-                "Remover automaticamente os vínculos que apontam para este fluxo",
-                value=True,
-                key=f"clean_refs_{flow_select}",
-            )
-            flow_confirmation = st.text_input(
-                "Digite o nome exato do fluxo para confirmar",
-                key=f"delete_flow_confirmation_{flow_select}",
-            )
-            delete_disabled = not flow_can_delete or flow_confirmation != current["name"]
-            if st.button(
-                "Excluir fluxo e seu histórico",
-                disabled=delete_disabled,
-                key=f"delete_flow_permanent_{flow_select}",
-                type="primary",
-            ):
-                try:
-                    if clean_references:
-                        remove_project_flow_references(selected_project_id, flow_select, username, is_admin=is_admin)
-                    if project.get("default_flow_id") == flow_select:
-                        remaining_id = next((item["id"] for item in flows if item["id"] != flow_select), "")
-                        update_project(selected_project_id, username, default_flow_id=remaining_id, is_admin=is_admin)
-                    if not delete_flowchart(flow_select, username, is_admin=is_admin):
-                        raise ProjectPermissionError("Somente o proprietário do fluxo pode excluí-lo permanentemente.")
-                    flash("Fluxo excluído permanentemente.", "info")
-                    st.rerun()
-                except Exception as exc:
-                    st.error(str(exc))
-            if not flow_can_delete:
-                st.caption("Somente o proprietário do fluxo ou um administrador pode realizar a exclusão permanente.")
+        delete_flow_panel = st.expander("Excluir fluxo permanentemente", expanded=False, key="project_delete_flow_panel", on_change="rerun")
+        with delete_flow_panel:
+            if delete_flow_panel.open:
+                impacts = project_impact(selected_project_id, username, flow_select, is_admin=is_admin)
+                if impacts:
+                    st.warning(f"Este fluxo é usado por {len(impacts)} card(s) de outros fluxos.")
+                    st.dataframe(pd.DataFrame([{
+                        "Fluxo pai": item.get("source_flow_name"),
+                        "Card": item.get("source_node_label"),
+                    } for item in impacts]), use_container_width=True, hide_index=True)
+                clean_references = st.checkbox(
+                    "Remover automaticamente os vínculos que apontam para este fluxo",
+                    value=True,
+                    key=f"clean_refs_{flow_select}",
+                )
+                flow_confirmation = st.text_input(
+                    "Digite o nome exato do fluxo para confirmar",
+                    key=f"delete_flow_confirmation_{flow_select}",
+                )
+                delete_disabled = not flow_can_delete or flow_confirmation != current["name"]
+                if st.button(
+                    "Excluir fluxo e seu histórico",
+                    disabled=delete_disabled,
+                    key=f"delete_flow_permanent_{flow_select}",
+                    type="primary",
+                ):
+                    try:
+                        if clean_references:
+                            remove_project_flow_references(selected_project_id, flow_select, username, is_admin=is_admin)
+                        if project.get("default_flow_id") == flow_select:
+                            remaining_id = next((item["id"] for item in flows if item["id"] != flow_select), "")
+                            update_project(selected_project_id, username, default_flow_id=remaining_id, is_admin=is_admin)
+                        if not delete_flowchart(flow_select, username, is_admin=is_admin):
+                            raise ProjectPermissionError("Somente o proprietário do fluxo pode excluí-lo permanentemente.")
+                        flash("Fluxo excluído permanentemente.", "info")
+                        st.rerun()
+                    except Exception as exc:
+                        st.error(str(exc))
+                if not flow_can_delete:
+                    st.caption("Somente o proprietário do fluxo ou um administrador pode realizar a exclusão permanente.")
     else:
         st.info("Nenhum fluxo vinculado.")
 
     accessible = list_flowcharts(username, include_all=is_admin)
     available = [item for item in accessible if item.get("project_id") != selected_project_id]
+    available_names = {item["id"]: item["name"] for item in available}
     with st.expander("Adicionar fluxo existente", expanded=not flows):
         if available:
-            existing_id = st.selectbox("Fluxo", [item["id"] for item in available], format_func=lambda value: next(item["name"] for item in available if item["id"] == value))
+            existing_id = st.selectbox("Fluxo", list(available_names), format_func=lambda value: available_names[value])
             role = st.selectbox("Papel inicial", list(PROJECT_ROLE_LABELS), format_func=lambda value: PROJECT_ROLE_LABELS[value], key="attach_role")
             group = st.text_input("Grupo", key="attach_group")
             if st.button("Adicionar ao projeto", disabled=not editable):
@@ -492,16 +496,15 @@ with main_tabs[5]:
         release_version = st.selectbox("Exportar release", [item["version"] for item in releases])
         st.download_button(
             "Baixar pacote imutável da release",
-            export_project_bundle(selected_project_id, username, is_admin=is_admin, release_version=int(release_version)),
+            partial(export_project_bundle, selected_project_id, username, is_admin=is_admin, release_version=int(release_version)),
             file_name=f"{project.get('code') or project['name']}_release_{release_version}.zip".lower().replace(" ", "_"),
             mime="application/zip",
         )
 
 with main_tabs[6]:
-    current_bundle = export_project_bundle(selected_project_id, username, is_admin=is_admin)
     st.download_button(
         "Baixar projeto completo",
-        current_bundle,
+        partial(export_project_bundle, selected_project_id, username, is_admin=is_admin),
         file_name=f"{project.get('code') or project['name']}_project.zip".lower().replace(" ", "_"),
         mime="application/zip",
         type="primary",
@@ -541,7 +544,8 @@ with main_tabs[7]:
         description = st.text_area("Descrição", value=project.get("description") or "", height=110)
         status = st.selectbox("Status", list(PROJECT_STATUS_LABELS), index=list(PROJECT_STATUS_LABELS).index(project.get("status")) if project.get("status") in PROJECT_STATUS_LABELS else 0, format_func=lambda value: PROJECT_STATUS_LABELS[value])
         visibility = st.radio("Visibilidade", ["private", "organization"], index=1 if project.get("visibility") == "organization" else 0, format_func=lambda value: "Organização" if value == "organization" else "Privado", horizontal=True)
-        default_flow = st.selectbox("Fluxo inicial", [""] + [item["id"] for item in flows], index=([""] + [item["id"] for item in flows]).index(project.get("default_flow_id")) if project.get("default_flow_id") in [item["id"] for item in flows] else 0, format_func=lambda value: "Não definido" if not value else flow_by_id[value]["name"])
+        default_flow_options = [""] + list(flow_by_id)
+        default_flow = st.selectbox("Fluxo inicial", default_flow_options, index=default_flow_options.index(project.get("default_flow_id")) if project.get("default_flow_id") in flow_by_id else 0, format_func=lambda value: "Não definido" if not value else flow_by_id[value]["name"])
         tags_text = st.text_input("Tags", value=", ".join(project.get("tags") or []))
         if st.form_submit_button("Salvar configurações", type="primary", disabled=not editable):
             try:
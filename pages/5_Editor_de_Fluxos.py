@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from copy import deepcopy
 from datetime import datetime
+from functools import partial
 from html import escape
 from uuid import uuid4
 
@@ -58,7 +59,7 @@ from services.project_repository import (
     project_impact,
     update_project,
 )
-from services.report_export import html_report, nodes_csv, pdf_report, raci_csv
+from services.report_export import cached_report
 from services.template_library import built_in_templates, clone_template
 
 st.set_page_config(page_title="Editor de Processos e Projetos", page_icon="🧭", layout="wide")
@@ -189,9 +190,10 @@ with st.sidebar:
         st.rerun()
 
     filter_text = st.text_input("Buscar processo", placeholder="Nome, status ou proprietário")
+    search_text = filter_text.lower()
     filtered = [
         item for item in flows
-        if filter_text.lower() in " ".join([
+        if not search_text or search_text in " ".join([
             item["name"], item.get("workflow_status", ""), item.get("owner_username", "")
         ]).lower()
     ]
@@ -399,6 +401,10 @@ if conflict and conflict.get("flow_id") == selected_id:
         flash(f"Conflito resolvido na revisão {saved['revision']}.")
         st.rerun()
 
+# Comentários carregados uma única vez: a aba de comentários exibe os 50 mais recentes
+# e o editor recebe a lista completa, já ordenada pelo MongoDB.
+comments = list_comments(selected_id, include_resolved=True)
+
 # Painéis de gestão.
 manage_tabs = st.tabs(["Governança", "Versões", "Colaboração", "Comentários", "Indicadores e relatórios", "Templates"])
 
@@ -521,9 +527,7 @@ with manage_tabs[2]:
         st.dataframe(pd.DataFrame([{"Usuário": item.get("username"), "Permissão": FLOW_ACCESS_LABELS.get(item.get("level"), item.get("level"))} for item in record["collaborators"]]), use_container_width=True, hide_index=True)
 
 with manage_tabs[3]:
-    comments = list_comments(selected_id, include_resolved=True)
-    unresolved = [item for item in comments if not item.get("resolved")]
-    st.metric("Comentários abertos", len(unresolved))
+    st.metric("Comentários abertos", sum(1 for item in comments if not item.get("resolved")))
     if comments:
         for item in comments[:50]:
             state_label = "Resolvido" if item.get("resolved") else "Aberto"
@@ -548,32 +552,35 @@ with manage_tabs[4]:
     st.dataframe(count_df, use_container_width=True, hide_index=True)
     safe_name = record["name"].replace(" ", "_").lower()
     with st.popover("Baixar relatórios", use_container_width=False):
-        st.download_button("Relatório PDF", pdf_report(editor_document), f"{safe_name}.pdf", "application/pdf", use_container_width=True)
-        st.download_button("Relatório HTML", html_report(editor_document), f"{safe_name}.html", "text/html", use_container_width=True)
-        st.download_button("Etapas CSV", nodes_csv(editor_document), f"{safe_name}_etapas.csv", "text/csv", use_container_width=True)
-        st.download_button("Matriz RACI", raci_csv(editor_document), f"{safe_name}_raci.csv", "text/csv", use_container_width=True)
-    with st.expander("Problemas identificados"):
-        issue_rows = issue_detail_rows(editor_document, analysis)
-        if issue_rows:
-            error_count = sum(1 for item in issue_rows if item["Gravidade"] == "Erro")
-            warning_count = len(issue_rows) - error_count
-            st.markdown(
-                f"**{error_count} item(ns) precisam de correção e {warning_count} são recomendações.** "
-                "A tabela informa qual card está afetado, por que isso importa e como corrigir."
-            )
-            st.dataframe(
-                pd.DataFrame(issue_rows),
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Card ID": None,
-                    "Card": st.column_config.TextColumn("Card afetado", width="medium"),
-                    "Por que importa": st.column_config.TextColumn("Por que isso é um problema", width="large"),
-                    "Como corrigir": st.column_config.TextColumn("Como corrigir", width="large"),
-                },
-            )
-        else:
-            st.success("Nenhum problema de qualidade foi identificado neste fluxo.")
+        # Os relatórios são gerados apenas no clique e reaproveitados enquanto o conteúdo não muda.
+        st.download_button("Relatório PDF", partial(cached_report, "pdf", editor_document), f"{safe_name}.pdf", "application/pdf", use_container_width=True)
+        st.download_button("Relatório HTML", partial(cached_report, "html", editor_document), f"{safe_name}.html", "text/html", use_container_width=True)
+        st.download_button("Etapas CSV", partial(cached_report, "nodes_csv", editor_document), f"{safe_name}_etapas.csv", "text/csv", use_container_width=True)
+        st.download_button("Matriz RACI", partial(cached_report, "raci_csv", editor_document), f"{safe_name}_raci.csv", "text/csv", use_container_width=True)
+    issues_panel = st.expander("Problemas identificados", key="editor_issues_panel", on_change="rerun")
+    with issues_panel:
+        if issues_panel.open:
+            issue_rows = issue_detail_rows(editor_document, analysis)
+            if issue_rows:
+                error_count = sum(1 for item in issue_rows if item["Gravidade"] == "Erro")
+                warning_count = len(issue_rows) - error_count
+                st.markdown(
+                    f"**{error_count} item(ns) precisam de correção e {warning_count} são recomendações.** "
+                    "A tabela informa qual card está afetado, por que isso importa e como corrigir."
+                )
+                st.dataframe(
+                    pd.DataFrame(issue_rows),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Card ID": None,
+                        "Card": st.column_config.TextColumn("Card afetado", width="medium"),
+                        "Por que importa": st.column_config.TextColumn("Por que isso é um problema", width="large"),
+                        "Como corrigir": st.column_config.TextColumn("Como corrigir", width="large"),
+                    },
+                )
+            else:
+                st.success("Nenhum problema de qualidade foi identificado neste fluxo.")
 
 with manage_tabs[5]:
     template_name = st.text_input("Nome do template", value=f"Template — {record['name']}")
@@ -619,7 +626,7 @@ for item in flows:
             if node.get("type") == "end" or str(node.get("id") or "") not in outgoing_ids
         ][:30]
     flow_catalog.append(catalog_item)
-comments_for_editor = serialize_comments(list_comments(selected_id, include_resolved=True))
+comments_for_editor = serialize_comments(comments)
 
 auto_play_request = st.session_state.get("project_auto_play_request")
 auto_play_active = isinstance(auto_play_request, dict) and auto_play_request.get("flow_id") == selected_id
@@ -786,32 +793,34 @@ if save_payload and editable:
     except (FlowPermissionError, ValueError, RuntimeError) as exc:
         st.error(str(exc))
 
-with st.expander("Administração do processo", expanded=False):
-    st.download_button(
-        "Baixar JSON salvo no MongoDB",
-        data=json.dumps(record["document"], ensure_ascii=False, indent=2),
-        file_name=f"{record['name'].replace(' ', '_').lower()}.json",
-        mime="application/json",
-    )
-    if permission == "owner":
-        impacts = project_impact(selected_project_id, username, selected_id, is_admin=is_admin) if selected_project_id else []
-        if impacts:
-            st.error(f"Este fluxo é referenciado por {len(impacts)} subprocesso(s). A exclusão criará vínculos quebrados no projeto.")
-            st.dataframe(pd.DataFrame([{
-                "Fluxo pai": item.get("source_flow_name"),
-                "Card": item.get("source_node_label"),
-            } for item in impacts]), use_container_width=True, hide_index=True)
-        st.warning("A exclusão remove o fluxo, as versões, comentários, aprovações e rascunhos.")
-        confirm_delete = st.checkbox("Confirmar exclusão permanente e os impactos no projeto", key="confirm_flow_delete")
-        if st.button("Excluir processo", disabled=not confirm_delete):
-            if delete_flowchart(selected_id, username, is_admin=is_admin):
-                if project and project.get("default_flow_id") == selected_id:
-                    remaining_id = next((item["id"] for item in flows if item["id"] != selected_id), "")
-                    update_project(selected_project_id, username, default_flow_id=remaining_id, is_admin=is_admin)
-                tabs_by_project = st.session_state.setdefault("project_open_flow_tabs", {})
-                open_tabs = tabs_by_project.setdefault(selected_project_id, [])
-                if selected_id in open_tabs:
-                    open_tabs.remove(selected_id)
-                st.session_state.pop("selected_flowchart_id", None)
-                flash("Processo excluído.")
-                st.rerun()
+admin_panel = st.expander("Administração do processo", expanded=False, key="editor_admin_panel", on_change="rerun")
+with admin_panel:
+    if admin_panel.open:
+        st.download_button(
+            "Baixar JSON salvo no MongoDB",
+            data=partial(json.dumps, record["document"], ensure_ascii=False, indent=2),
+            file_name=f"{record['name'].replace(' ', '_').lower()}.json",
+            mime="application/json",
+        )
+        if permission == "owner":
+            impacts = project_impact(selected_project_id, username, selected_id, is_admin=is_admin) if selected_project_id else []
+            if impacts:
+                st.error(f"Este fluxo é referenciado por {len(impacts)} subprocesso(s). A exclusão criará vínculos quebrados no projeto.")
+                st.dataframe(pd.DataFrame([{
+                    "Fluxo pai": item.get("source_flow_name"),
+                    "Card": item.get("source_node_label"),
+                } for item in impacts]), use_container_width=True, hide_index=True)
+            st.warning("A exclusão remove o fluxo, as versões, comentários, aprovações e rascunhos.")
+            confirm_delete = st.checkbox("Confirmar exclusão permanente e os impactos no projeto", key="confirm_flow_delete")
+            if st.button("Excluir processo", disabled=not confirm_delete):
+                if delete_flowchart(selected_id, username, is_admin=is_admin):
+                    if project and project.get("default_flow_id") == selected_id:
+                        remaining_id = next((item["id"] for item in flows if item["id"] != selected_id), "")
+                        update_project(selected_project_id, username, default_flow_id=remaining_id, is_admin=is_admin)
+                    tabs_by_project = st.session_state.setdefault("project_open_flow_tabs", {})
+                    open_tabs = tabs_by_project.setdefault(selected_project_id, [])
+                    if selected_id in open_tabs:
+                        open_tabs.remove(selected_id)
+                    st.session_state.pop("selected_flowchart_id", None)
+                    flash("Processo excluído.")
+                    st.rerun()
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from collections import Counter, defaultdict, deque
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
+from copy import deepcopy
 from typing import Any
 
 EXCEPTION_WORDS = (
     "erro", "falha", "recus", "cancel", "bloque", "expir", "indispon",
     "pendente", "corrigir", "reprocess", "exceção", "excecao",
 )
+_EXCEPTION_PATTERN = re.compile("|".join(re.escape(word) for word in EXCEPTION_WORDS))
+
+ANALYSIS_CACHE_SIZE = 256
+_analysis_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
 
 def _active_graph(document: dict[str, Any]):
@@ -91,44 +99,72 @@ def _is_exception(node: dict) -> bool:
         str(data.get("label") or ""), str(data.get("description") or ""),
         " ".join(str(tag) for tag in data.get("tags", [])),
     ]).lower()
-    return any(word in text for word in EXCEPTION_WORDS)
+    return _EXCEPTION_PATTERN.search(text) is not None
 
 
 def analyze_document(document: dict[str, Any]) -> dict[str, Any]:
     nodes, node_map, edges, outgoing, incoming = _active_graph(document)
     lanes = document.get("lanes", [])
-    starts = [node["id"] for node in nodes if node.get("type") == "start"]
-    ends = [node["id"] for node in nodes if node.get("type") == "end"]
+    starts: list[str] = []
+    ends: list[str] = []
+    decisions: list[dict] = []
+    subprocesses: list[dict] = []
+    integrations: list[dict] = []
+    exceptions: list[dict] = []
+    missing_description: list[str] = []
+    missing_owner: list[str] = []
+    missing_sla_critical: list[str] = []
+    subprocess_unlinked: list[str] = []
+    sla_relevant = 0
+    total_sla = 0.0
+    lane_counts: Counter[str] = Counter()
+    type_counts: Counter[str] = Counter()
+    level_counts: Counter[str] = Counter()
+    criticality_counts: Counter[str] = Counter()
+    # Uma única varredura alimenta contagens, pendências e distribuições.
+    for node in nodes:
+        node_id, node_type, data = node["id"], node.get("type"), node.get("data", {})
+        if node_type == "start":
+            starts.append(node_id)
+        elif node_type == "end":
+            ends.append(node_id)
+        elif node_type == "decision":
+            decisions.append(node)
+        elif node_type == "subprocess":
+            subprocesses.append(node)
+            if not data.get("linkedFlowId"):
+                subprocess_unlinked.append(node_id)
+        elif node_type == "api":
+            integrations.append(node)
+        if _is_exception(node):
+            exceptions.append(node)
+        total_sla += float(data.get("slaMinutes") or 0)
+        if not str(data.get("description") or "").strip():
+            missing_description.append(node_id)
+        if not str(data.get("owner") or "").strip():
+            missing_owner.append(node_id)
+        if data.get("criticality") in {"high", "critical"}:
+            sla_relevant += 1
+            if not data.get("slaMinutes"):
+                missing_sla_critical.append(node_id)
+        lane_counts[node.get("laneId") or "Sem raia"] += 1
+        type_counts[node_type or "task"] += 1
+        level_counts[data.get("level") or "operational"] += 1
+        criticality_counts[data.get("criticality") or "medium"] += 1
+
     reachable = _reachable(starts, outgoing) if starts else set()
     inaccessible = [node["id"] for node in nodes if starts and node["id"] not in reachable]
     cycle_nodes = sorted(_cycle_nodes(nodes, outgoing))
-    decisions = [node for node in nodes if node.get("type") == "decision"]
-    subprocesses = [node for node in nodes if node.get("type") == "subprocess"]
-    integrations = [node for node in nodes if node.get("type") == "api"]
-    exceptions = [node for node in nodes if _is_exception(node)]
     lane_transitions = sum(
         1 for edge in edges
         if node_map[edge["source"]].get("laneId") != node_map[edge["target"]].get("laneId")
     )
     longest = _longest_acyclic_path(starts or ([nodes[0]["id"]] if nodes else []), outgoing)
-    total_sla = sum(float(node.get("data", {}).get("slaMinutes") or 0) for node in nodes)
-
-    missing_description = [node["id"] for node in nodes if not str(node.get("data", {}).get("description") or "").strip()]
-    missing_owner = [node["id"] for node in nodes if not str(node.get("data", {}).get("owner") or "").strip()]
-    missing_sla_critical = [
-        node["id"] for node in nodes
-        if node.get("data", {}).get("criticality") in {"high", "critical"}
-        and not node.get("data", {}).get("slaMinutes")
-    ]
     decisions_invalid = [
         node["id"] for node in decisions
         if len(outgoing.get(node["id"], [])) < 2
         or any(not str(edge.get("label") or edge.get("condition") or "").strip() for edge in outgoing.get(node["id"], []))
     ]
-    subprocess_unlinked = [
-        node["id"] for node in subprocesses
-        if not node.get("data", {}).get("linkedFlowId")
-    ]
 
     structure_score = 100
     structure_score -= min(35, len(inaccessible) * 4)
@@ -139,8 +175,7 @@ def analyze_document(document: dict[str, Any]) -> dict[str, Any]:
 
     documentation_score = 100 if not nodes else round(100 * (1 - len(missing_description) / len(nodes)))
     responsibility_score = 100 if not nodes else round(100 * (1 - len(missing_owner) / len(nodes)))
-    sla_relevant = [node for node in nodes if node.get("data", {}).get("criticality") in {"high", "critical"}]
-    sla_score = 100 if not sla_relevant else round(100 * (1 - len(missing_sla_critical) / len(sla_relevant)))
+    sla_score = 100 if not sla_relevant else round(100 * (1 - len(missing_sla_critical) / sla_relevant))
     subprocess_score = 100 if not subprocesses else round(100 * (1 - len(subprocess_unlinked) / len(subprocesses)))
     quality_score = max(0, round(
         max(0, structure_score) * .38
@@ -150,11 +185,6 @@ def analyze_document(document: dict[str, Any]) -> dict[str, Any]:
         + subprocess_score * .13
     ))
 
-    lane_counts = Counter(node.get("laneId") or "Sem raia" for node in nodes)
-    type_counts = Counter(node.get("type") or "task" for node in nodes)
-    level_counts = Counter(node.get("data", {}).get("level") or "operational" for node in nodes)
-    criticality_counts = Counter(node.get("data", {}).get("criticality") or "medium" for node in nodes)
-
     return {
         "quality_score": quality_score,
         "scores": {
@@ -191,6 +221,23 @@ def analyze_document(document: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def cached_analysis(document: dict[str, Any], content_hash: str) -> dict[str, Any]:
+    """Memoiza analyze_document pelo hash do conteúdo persistido no MongoDB."""
+    if not content_hash:
+        return analyze_document(document)
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(content_hash)
+        if cached is not None:
+            _analysis_cache.move_to_end(content_hash)
+            return deepcopy(cached)
+    result = analyze_document(document)
+    with _analysis_cache_lock:
+        _analysis_cache[content_hash] = result
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return deepcopy(result)
+
+
 def build_raci_rows(document: dict[str, Any]) -> list[dict[str, str]]:
     lane_by_id = {lane.get("id"): lane.get("name", "") for lane in document.get("lanes", [])}
     rows: list[dict[str, str]] = []
@@ -181,6 +181,34 @@ def get_flowchart(
     return result
 
 
+def get_flowcharts(
+    flowchart_ids: list[str],
+    *,
+    actor_username: str,
+    is_admin: bool = False,
+) -> list[dict]:
+    """Carrega vários fluxos com documento em uma única consulta, na ordem informada."""
+    initialize_flowchart_tables()
+    ids = [str(item) for item in flowchart_ids]
+    if not ids:
+        return []
+    actor = actor_username.strip().lower()
+    try:
+        records = {str(record["_id"]): record for record in _flow_collection().find({"_id": {"$in": ids}})}
+    except PyMongoError as exc:
+        raise RuntimeError("Falha ao carregar os fluxos no MongoDB.") from exc
+    result: list[dict] = []
+    for flow_id in ids:
+        record = records.get(flow_id)
+        permission = permission_for(record, actor, is_admin=is_admin) if record else None
+        if permission is None:
+            continue
+        serialized = _serialize_record(record, include_document=True)
+        serialized["permission"] = permission
+        result.append(serialized)
+    return result
+
+
 def _version_payload(
     flow_id: str,
     version: int,
@@ -505,6 +533,17 @@ def list_comments(flowchart_id: str, *, include_resolved: bool = True, target_ki
     return list(_collection(FLOWCHART_COMMENTS_COLLECTION).find(query).sort("created_at", DESCENDING))
 
 
+def count_open_comments(flowchart_ids: list[str]) -> dict[str, int]:
+    ids = [str(item) for item in flowchart_ids]
+    if not ids:
+        return {}
+    pipeline = [
+        {"$match": {"flowchart_id": {"$in": ids}, "resolved": False}},
+        {"$group": {"_id": "$flowchart_id", "total": {"$sum": 1}}},
+    ]
+    return {str(item["_id"]): int(item["total"]) for item in _collection(FLOWCHART_COMMENTS_COLLECTION).aggregate(pipeline)}
+
+
 def resolve_comment(comment_id: str, actor: str, resolved: bool = True) -> bool:
     result = _collection(FLOWCHART_COMMENTS_COLLECTION).update_one({"_id": str(comment_id)}, {"$set": {"resolved": bool(resolved), "resolved_by": actor.strip().lower(), "resolved_at": utc_now(), "updated_at": utc_now()}})
     return result.matched_count > 0
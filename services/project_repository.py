@@ -24,11 +24,12 @@ from core.configuration import (
     PROJECTS_COLLECTION,
 )
 from schemas.flowchart_schema import normalize_document, repair_import_document, validate_document
-from services.flow_analytics import analyze_document, issue_detail_rows
+from services.flow_analytics import cached_analysis, issue_detail_rows
 from services.flowchart_repository import (
     can_edit,
     document_hash,
     get_flowchart,
+    get_flowcharts,
     get_version,
     list_flowcharts,
     permission_for as flow_permission_for,
@@ -322,12 +323,7 @@ def list_project_flows(project_id: str, username: str, *, is_admin: bool = False
     flows = list_flowcharts(username, include_all=is_admin, project_id=project_id)
     flows.sort(key=lambda item: (int(item.get("project_order") or 0), item.get("name", "")))
     if include_documents:
-        detailed: list[dict[str, Any]] = []
-        for item in flows:
-            record = get_flowchart(item["id"], actor_username=username, is_admin=is_admin)
-            if record:
-                detailed.append(record)
-        return detailed
+        return get_flowcharts([item["id"] for item in flows], actor_username=username, is_admin=is_admin)
     return flows
 
 
@@ -490,7 +486,7 @@ def analyze_project(project_id: str, username: str, *, is_admin: bool = False) -
     quality_rows: list[dict[str, Any]] = []
     total_nodes = total_edges = total_issues = 0
     for record in records:
-        analysis = analyze_document(record["document"])
+        analysis = cached_analysis(record["document"], record.get("document_hash", ""))
         total_nodes += len(record["document"].get("nodes", []))
         total_edges += len(record["document"].get("edges", []))
         issue_count = sum(len(value) for value in analysis.get("issues", {}).values() if isinstance(value, list))
@@ -715,7 +711,7 @@ def export_project_bundle(project_id: str, username: str, *, is_admin: bool = Fa
     project = get_project(project_id, username, is_admin=is_admin)
     if not project:
         raise ValueError("Projeto não encontrado.")
-    current_flows = list_project_flows(project_id, username, is_admin=is_admin)
+    current_flows = list_project_flows(project_id, username, is_admin=is_admin, include_documents=release_version is None)
     release = None
     export_flows = current_flows
     release_documents: dict[str, dict[str, Any]] = {}
@@ -745,8 +741,7 @@ def export_project_bundle(project_id: str, username: str, *, is_admin: bool = Fa
                 if document is None:
                     document = get_version(flow["id"], int(flow.get("current_version") or 1))
             else:
-                record = get_flowchart(flow["id"], actor_username=username, is_admin=is_admin)
-                document = record.get("document") if record else None
+                document = flow.get("document")
             if document:
                 archive.writestr(f"flows/{flow['id']}.json", json.dumps(document, ensure_ascii=False, indent=2))
         archive.writestr("README.txt", (
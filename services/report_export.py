@@ -3,41 +3,49 @@ from __future__ import annotations
 import csv
 import html
 import io
-from typing import Any
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import mm
-from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
 
 from services.flow_analytics import analyze_document, build_raci_rows
+from services.flowchart_repository import document_hash
+
+REPORT_CACHE_SIZE = 32
+_report_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+
+def _csv_bytes(fieldnames: list[str], rows: Iterable[dict[str, Any]]) -> bytes:
+    """Codifica as linhas direto no buffer binário, sem montar uma str intermediária."""
+    buffer = io.BytesIO()
+    stream = io.TextIOWrapper(buffer, encoding="utf-8-sig", newline="")
+    writer = csv.DictWriter(stream, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    stream.flush()
+    return buffer.getvalue()
 
 
 def nodes_csv(document: dict[str, Any]) -> bytes:
     lane_names = {lane.get("id"): lane.get("name", "") for lane in document.get("lanes", [])}
-    buffer = io.StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=["id", "tipo", "nome", "raia", "responsavel", "criticidade", "nivel", "sla_minutos", "descricao", "tags"])
-    writer.writeheader()
-    for node in document.get("nodes", []):
-        data = node.get("data", {})
-        writer.writerow({
-            "id": node.get("id", ""), "tipo": node.get("type", ""),
-            "nome": data.get("label", ""), "raia": lane_names.get(node.get("laneId"), ""),
-            "responsavel": data.get("owner", ""), "criticidade": data.get("criticality", ""),
-            "nivel": data.get("level", ""), "sla_minutos": data.get("slaMinutes") or "",
-            "descricao": data.get("description", ""), "tags": ", ".join(data.get("tags", [])),
-        })
-    return buffer.getvalue().encode("utf-8-sig")
+
+    def rows() -> Iterable[dict[str, Any]]:
+        for node in document.get("nodes", []):
+            data = node.get("data", {})
+            yield {
+                "id": node.get("id", ""), "tipo": node.get("type", ""),
+                "nome": data.get("label", ""), "raia": lane_names.get(node.get("laneId"), ""),
+                "responsavel": data.get("owner", ""), "criticidade": data.get("criticality", ""),
+                "nivel": data.get("level", ""), "sla_minutos": data.get("slaMinutes") or "",
+                "descricao": data.get("description", ""), "tags": ", ".join(data.get("tags", [])),
+            }
+
+    return _csv_bytes(["id", "tipo", "nome", "raia", "responsavel", "criticidade", "nivel", "sla_minutos", "descricao", "tags"], rows())
 
 
 def raci_csv(document: dict[str, Any]) -> bytes:
     rows = build_raci_rows(document)
-    buffer = io.StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]) if rows else ["Etapa"])
-    writer.writeheader()
-    writer.writerows(rows)
-    return buffer.getvalue().encode("utf-8-sig")
+    return _csv_bytes(list(rows[0]) if rows else ["Etapa"], rows)
 
 
 def html_report(document: dict[str, Any]) -> bytes:
@@ -64,6 +72,13 @@ def html_report(document: dict[str, Any]) -> bytes:
 
 
 def pdf_report(document: dict[str, Any]) -> bytes:
+    # O reportlab custa ~200 ms para importar; só carrega quando um PDF é pedido.
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
     flow = document.get("flow", {})
     analysis = analyze_document(document)
     buffer = io.BytesIO()
@@ -112,3 +127,26 @@ def pdf_report(document: dict[str, Any]) -> bytes:
         story.append(raci_table)
     doc.build(story)
     return buffer.getvalue()
+
+
+REPORT_BUILDERS: dict[str, Callable[[dict[str, Any]], bytes]] = {
+    "pdf": pdf_report,
+    "html": html_report,
+    "nodes_csv": nodes_csv,
+    "raci_csv": raci_csv,
+}
+
+
+def cached_report(kind: str, document: dict[str, Any]) -> bytes:
+    """Reaproveita o relatório já gerado enquanto o conteúdo do fluxo não muda."""
+    key = (kind, document_hash(document))
+    with _report_cache_lock:
+        if key in _report_cache:
+            _report_cache.move_to_end(key)
+            return _report_cache[key]
+    payload = REPORT_BUILDERS[kind](document)
+    with _report_cache_lock:
+        _report_cache[key] = payload
+        while len(_report_cache) > REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+    return payload
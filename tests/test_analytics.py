@@ -2,7 +2,7 @@ import json
 from pathlib import Path
 
 from schemas.flowchart_schema import demo_flowchart_document, normalize_document
-from services.flow_analytics import analyze_document, build_raci_rows
+from services.flow_analytics import analyze_document, build_raci_rows, cached_analysis
 
 
 def test_demo_analytics():
@@ -12,6 +12,8 @@ def test_demo_analytics():
     assert result["counts"]["decisions"] == 1
     assert 0 <= result["quality_score"] <= 100
     assert len(build_raci_rows(document)) == 6
+    for distribution in result["distribution"].values():
+        assert sum(distribution.values()) == result["counts"]["nodes"]
 
 
 def test_large_sigyo_regression_file():
@@ -21,3 +23,14 @@ def test_large_sigyo_regression_file():
     assert result["counts"]["nodes"] >= 100
     assert result["counts"]["lanes"] >= 10
     assert result["counts"]["decisions"] >= 10
+
+
+def test_cached_analysis_reuses_result_by_content_hash():
+    document = normalize_document(demo_flowchart_document("tester"), "tester")
+    first = cached_analysis(document, "hash-demo")
+    first["quality_score"] = -1
+    document["nodes"] = []
+    cached = cached_analysis(document, "hash-demo")
+    assert cached["counts"]["nodes"] == 6
+    assert cached["quality_score"] != -1
+    assert cached_analysis(document, "")["counts"]["nodes"] == 0
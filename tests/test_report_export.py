@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import csv
+import io
+
+from schemas.flowchart_schema import demo_flowchart_document, normalize_document
+from services.report_export import cached_report, nodes_csv, raci_csv
+
+
+def test_csv_exports_keep_bom_and_one_row_per_node():
+    document = normalize_document(demo_flowchart_document("tester"), "tester")
+    for payload in (nodes_csv(document), raci_csv(document)):
+        assert payload.startswith(b"\xef\xbb\xbf")
+        rows = list(csv.DictReader(io.StringIO(payload.decode("utf-8-sig"))))
+        assert len(rows) == len(document["nodes"])
+    first = next(csv.DictReader(io.StringIO(nodes_csv(document).decode("utf-8-sig"))))
+    assert first["id"] == document["nodes"][0]["id"]
+
+
+def test_cached_report_is_keyed_by_document_content():
+    document = normalize_document(demo_flowchart_document("tester"), "tester")
+    first = cached_report("nodes_csv", document)
+    assert cached_report("nodes_csv", document) is first
+    document["nodes"][0]["data"]["label"] = "Etapa renomeada"
+    changed = cached_report("nodes_csv", document)
+    assert changed is not first
+    assert "Etapa renomeada" in changed.decode("utf-8-sig")
@@ -70,7 +70,9 @@ def test_repository_concurrency_drafts_comments_and_governance(monkeypatch):
     )
     comments = repository.list_comments(created["id"])
     assert comments[0]["_id"] == comment_id
+    assert repository.count_open_comments([created["id"], "flow_missing"]) == {created["id"]: 1}
     assert repository.resolve_comment(comment_id, "owner") is True
+    assert repository.count_open_comments([created["id"]]) == {}
 
     repository.set_collaborators(
         created["id"],
@@ -81,6 +83,11 @@ def test_repository_concurrency_drafts_comments_and_governance(monkeypatch):
     shared = repository.get_flowchart(created["id"], actor_username="reviewer")
     assert shared is not None
     assert shared["permission"] == "approver"
+    batch = repository.get_flowcharts([created["id"], "flow_missing"], actor_username="reviewer")
+    assert [item["id"] for item in batch] == [created["id"]]
+    assert batch[0]["permission"] == "approver"
+    assert batch[0]["document"] == shared["document"]
+    assert repository.get_flowcharts([created["id"]], actor_username="stranger") == []
 
     repository.transition_workflow(created["id"], "owner", "submit_review")
     repository.transition_workflow(created["id"], "reviewer", "approve")